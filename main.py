@@ -27,24 +27,31 @@ System Dependencies:
 Required Python Libraries:
 --------------------------
 - requests
+- requests-toolbelt
 - jdatetime
 """
 
+import contextlib
 import json
 import logging
 import os
-import re
+import queue
+import select
 import sys
+import threading
 import time
 import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List
 from datetime import datetime, timezone, timedelta
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter, Retry
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
     import jdatetime
 except ImportError:
     print("Error: A required library is missing.")
@@ -71,9 +78,19 @@ class ColorFormatter(logging.Formatter):
         logging.CRITICAL: BOLD_RED + FORMAT + RESET,
     }
 
+    def __init__(self):
+        super().__init__()
+        # One formatter per level, built once, instead of allocating a new
+        # logging.Formatter for every record.
+        self._formatters = {
+            level: logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+            for level, log_fmt in self.FORMATS.items()
+        }
+
     def format(self, record: logging.LogRecord) -> str:
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+        formatter = self._formatters.get(record.levelno)
+        if formatter is None:
+            formatter = self._formatters[logging.INFO]
         return formatter.format(record)
 
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
@@ -99,6 +116,7 @@ class ConfigManager:
         self.log = log
         self.config_path = config_path
         self.config: Dict[str, Any] = {}
+        self.available_7z_methods: set = set()
 
     def load(self) -> Dict[str, Any]:
         """Loads the main preferences.json, injects secrets, and validates critical values."""
@@ -116,6 +134,11 @@ class ConfigManager:
 
         self._inject_environment_variables()
         self._validate_critical_configs()
+
+        self.available_7z_methods = detect_7z_methods(self.log)
+        if self.available_7z_methods:
+            self.log.info(f"7-Zip binary advertises methods: {', '.join(sorted(self.available_7z_methods))}")
+
         self.log.info("Configuration loaded successfully.")
         return self.config
 
@@ -167,69 +190,247 @@ class RuntimeManager:
 # 3. UTILITY FUNCTIONS
 # ================================================================
 
+# Characters that must be escaped for Telegram's MarkdownV2 parse mode.
+# Each special maps to its backslash-escaped form; str.translate applies the
+# table in a single C-level pass, far faster than a regex substitution.
+_MDV2_SPECIALS = r'_*[]()~>#+-=|{}.!'
+_MDV2_TABLE = str.maketrans({c: '\\' + c for c in _MDV2_SPECIALS})
+_BACKTICK = '`'
+
 def escape_markdown_v2(text: str) -> str:
     """
     Escapes text for Telegram's MarkdownV2 parse mode, preserving code blocks.
-    
+
     It splits the string by the backtick (`) character. Text outside the
     backticks (at even indices) is escaped, while text inside (at odd indices)
     is left untouched. This allows for monospace formatting while preventing
     parsing errors from other special characters.
     """
-    escape_chars = r'_*[]()~>#+-=|{}.!'
-    
-    parts = text.split('`')
+    parts = text.split(_BACKTICK)
     escaped_parts = []
-    
+
     for i, part in enumerate(parts):
         if i % 2 == 0:
-            escaped_parts.append(re.sub(f'([{re.escape(escape_chars)}])', r'\\\1', part))
+            escaped_parts.append(part.translate(_MDV2_TABLE))
         else:
             escaped_parts.append(part)
-            
-    return '`'.join(escaped_parts)
 
-def create_multivolume_archive(log: logging.Logger, directory_to_zip: Path, archive_output_path: Path, chunk_size_mb: int) -> List[Path]:
+    return _BACKTICK.join(escaped_parts)
+
+def tree_size(root: Path) -> int:
+    """
+    Returns the total size in bytes of all regular files under `root`.
+
+    Uses an iterative os.scandir walk rather than Path.rglob: scandir reuses
+    the stat information the directory entries already carry, which is
+    several times faster on trees with many files.
+    """
+    total = 0
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+def select_ram_backed_dir(estimated_need_bytes: int):
+    """
+    Returns '/dev/shm' when that RAM-backed filesystem exists (Linux) and has
+    enough free space for the estimated archive footprint, or None so that
+    tempfile falls back to the default temporary location.
+    """
+    shm_dir = Path('/dev/shm')
+    try:
+        if shm_dir.is_dir() and shutil.disk_usage(shm_dir).free > estimated_need_bytes:
+            return str(shm_dir)
+    except OSError:
+        pass
+    return None
+
+def detect_7z_methods(log: logging.Logger) -> set:
+    """
+    Queries the installed 7-Zip binary (`7z i`) for the compression methods
+    it supports. Returns an empty set if the query fails, in which case
+    callers should assume only the standard methods are available.
+    """
+    try:
+        process = subprocess.run(
+            ['7z', 'i'],
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding='utf-8'
+        )
+    except (FileNotFoundError, subprocess.CalledProcessError, OSError) as e:
+        log.warning(f"Could not query 7-Zip for supported methods: {e}")
+        return set()
+
+    # Only the "Codecs:" section lists compression methods; the rest of the
+    # `7z i` output (version banner, Libs:, Formats:) must be ignored.
+    # Codec lines look like " 0 ED  30101 LZMA2" with the name last.
+    methods = set()
+    in_codecs_section = False
+    for line in process.stdout.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            in_codecs_section = False
+            continue
+        if stripped.endswith(':'):
+            in_codecs_section = stripped.lower() == 'codecs:'
+            continue
+        if in_codecs_section:
+            methods.add(stripped.split()[-1].lower())
+    return methods
+
+def create_multivolume_archive(log: logging.Logger, directory_to_zip: Path, archive_output_path: Path, chunk_size_mb: int, threads: int = 0, method: str = 'lzma2', level: int = 9, part_queue: "queue.Queue" = None, source_size_bytes: int = -1, solid_block_mb: int = 16) -> List[Path]:
     """
-    Creates a multi-volume (split) .7z archive using the 7-Zip command-line tool
-    with the highest compression settings (LZMA2).
+    Creates a multi-volume (split) .7z archive using the 7-Zip command-line tool.
+
+    Compression runs multi-threaded: `threads` selects the number of 7-Zip
+    worker threads, defaulting to the machine's CPU count when 0. `method`
+    selects the compression method: `flzma2` (Fast-LZMA2) is markedly faster
+    than plain `lzma2` at the same ratio, and `zstd` trades a modest ratio
+    loss for much higher throughput when compression dominates wall time.
+    `level` maps to 7-Zip's `-mx` (1 = fastest, 9 = ultra).
+
+    When `part_queue` is given, completed volume parts are pushed onto it as
+    `(part_num, total_parts, path)` tuples while 7-Zip is still running, so
+    uploads can overlap compression. 7-Zip writes volumes sequentially, so
+    volumes 2..N are complete as soon as a later-numbered part exists. The
+    first volume is the exception: it holds the .7z start header, which
+    7-Zip back-patches by seeking to offset 0 after the last volume is
+    written, so `.001` is only enqueued once the process has exited.
+    `total_parts` is None for streamed volumes because the final count is
+    unknown while parts are still being produced. Single-part archives are
+    never enqueued here — the caller handles renaming and sending those
+    itself.
+
+    When `source_size_bytes` (pre-measured by the caller) comfortably fits a
+    single chunk, the `-v` switch is omitted so 7-Zip writes `archive.7z`
+    directly instead of a lone `.7z.001` that would need renaming.
+
+    `solid_block_mb` caps the solid-block size (`-ms`): 7-Zip's default solid
+    mode packs everything into one block that a single thread must compress,
+    so smaller blocks unlock multi-threading on many-file inputs for a small
+    (1-3%) ratio cost. 0 disables solid mode entirely (maximum parallelism,
+    roughly 3-5% worse ratio).
     """
     if not directory_to_zip.is_dir():
         log.error(f"Cannot zip '{directory_to_zip}' as it is not a valid directory.")
         return []
 
     source_path = str(directory_to_zip / '.')
-    
+
+    if threads <= 0:
+        threads = os.cpu_count() or 1
+
+    single_volume = 0 <= source_size_bytes < chunk_size_mb * 1024 * 1024 * 0.9
+
+    solid_switch = '-ms=off' if solid_block_mb <= 0 else f'-ms={solid_block_mb}m'
+
+    command = ['7z', 'a', '-t7z', f'-m0={method}', f'-mx={level}', f'-mmt={threads}', solid_switch]
+    if not single_volume:
+        command.append(f'-v{chunk_size_mb}m')
+    command += [str(archive_output_path), source_path]
+
+    return _run_7z(log, command, archive_output_path, part_queue)
+
+def create_multivolume_archive_from_stream(log: logging.Logger, tar_stream, archive_output_path: Path, chunk_size_mb: int, threads: int = 0, method: str = 'lzma2', level: int = 9, part_queue: "queue.Queue" = None, solid_block_mb: int = 16) -> List[Path]:
+    """
+    Like `create_multivolume_archive`, but compresses a tar stream read from
+    `tar_stream` (typically `git archive` stdout) via 7-Zip's `-si` switch,
+    so no working tree is ever materialized on disk. The resulting archive
+    contains a single `<name>.tar` entry. The stream's size is unknown up
+    front, so the output is always volume-split.
+    """
+    if threads <= 0:
+        threads = os.cpu_count() or 1
+
+    solid_switch = '-ms=off' if solid_block_mb <= 0 else f'-ms={solid_block_mb}m'
+    inner_name = archive_output_path.stem + '.tar'
+
     command = [
-        '7z', 'a', '-t7z', '-m0=lzma2', '-mx=9', f'-v{chunk_size_mb}m',
-        str(archive_output_path),
-        source_path
+        '7z', 'a', '-t7z', f'-m0={method}', f'-mx={level}', f'-mmt={threads}', solid_switch,
+        f'-si{inner_name}', f'-v{chunk_size_mb}m',
+        str(archive_output_path)
     ]
 
+    return _run_7z(log, command, archive_output_path, part_queue, stdin_source=tar_stream)
+
+def _run_7z(log: logging.Logger, command: List[str], archive_output_path: Path, part_queue: "queue.Queue" = None, stdin_source=None) -> List[Path]:
+    """
+    Runs the given 7-Zip command, optionally feeding `stdin_source` to it,
+    and returns the produced archive parts. While 7-Zip is running, a
+    watcher thread pushes completed parts onto `part_queue` (see
+    `create_multivolume_archive` for the queue contract).
+    """
+    def collect_parts() -> List[Path]:
+        return sorted(archive_output_path.parent.glob(f"{archive_output_path.name}.*"))
+
+    enqueued_parts: set = set()
+
+    def enqueue_part(part_path: Path, total_parts):
+        if part_path in enqueued_parts:
+            return
+        enqueued_parts.add(part_path)
+        part_num = int(part_path.suffix.lstrip('.'))
+        part_queue.put((part_num, total_parts, part_path))
+
     log.info(f"Executing 7-Zip command for maximum compression .7z archive...")
     log.debug(f"Command: {' '.join(command)}")
     try:
-        process = subprocess.run(
+        # 7-Zip prints a progress line per file; discard stdout so memory
+        # stays constant regardless of how many files are archived. Only
+        # stderr is kept for error reporting.
+        process = subprocess.Popen(
             command,
-            check=True,
-            capture_output=True,
+            stdin=stdin_source,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             encoding='utf-8'
         )
-        log.info("7-Zip process completed successfully.")
-        log.debug(f"7-Zip output:\n{process.stdout}")
     except FileNotFoundError:
         log.critical("7-Zip command ('7z') not found. Please ensure 7-Zip is installed and in your system's PATH.")
         return []
-    except subprocess.CalledProcessError as e:
-        log.error(f"7-Zip failed with exit code {e.returncode}.\nStderr: {e.stderr}")
-        return []
     except Exception as e:
         log.error(f"An unexpected error occurred during 7-Zip execution: {e}")
         return []
 
-    archive_parts = sorted(archive_output_path.parent.glob(f"{archive_output_path.name}.*"))
-    
+    watcher = None
+    stop_watching = threading.Event()
+    if part_queue is not None:
+        def watch_parts():
+            while not stop_watching.wait(0.5):
+                # 7-Zip writes volumes strictly in order, so all parts but
+                # the newest are finished — except the first volume, whose
+                # start header is back-patched after the final volume, so it
+                # must wait for the post-exit drain.
+                for part_path in collect_parts()[1:-1]:
+                    enqueue_part(part_path, None)
+        watcher = threading.Thread(target=watch_parts, name="PartWatcher", daemon=True)
+        watcher.start()
+
+    _, stderr_text = process.communicate()
+
+    if watcher is not None:
+        stop_watching.set()
+        watcher.join()
+
+    if process.returncode != 0:
+        log.error(f"7-Zip failed with exit code {process.returncode}.\nStderr: {stderr_text}")
+        return []
+
+    log.info("7-Zip process completed successfully.")
+
+    archive_parts = collect_parts()
+
     if not archive_parts:
         if archive_output_path.exists():
              log.info("Archive was created as a single file (smaller than chunk size).")
@@ -237,6 +438,11 @@ def create_multivolume_archive(log: logging.Logger, directory_to_zip: Path, arch
         log.error("Could not find any archive parts created by 7-Zip.")
         return []
 
+    if part_queue is not None and len(archive_parts) > 1:
+        # Drain any parts the watcher had not yet seen, including the final one.
+        for part_path in archive_parts:
+            enqueue_part(part_path, None)
+
     log.info(f"Found {len(archive_parts)} archive parts created by 7-Zip.")
     return archive_parts
 
@@ -251,20 +457,64 @@ class FolderFetcher:
         self.repo_config = config.get('source_repo', {})
         self.repo_url = self.repo_config.get('url')
         self.branch = self.repo_config.get('branch', 'main')
+        self.folder_to_zip = self.repo_config.get('folder_to_zip')
+        self.sparse = self.repo_config.get('sparse', True)
 
     def clone_repo(self, temp_dir: Path) -> bool:
-        """Clones the configured repository into the specified temporary directory."""
+        """
+        Clones the configured repository into the specified temporary directory.
+
+        When `source_repo.sparse` is enabled (the default) and a target folder
+        is configured, only that folder's objects are fetched via a
+        blob-filtered sparse checkout, so transfer and checkout cost scale
+        with the folder rather than the whole repository. Falls back to a
+        full shallow clone if the server or local Git lacks support
+        (requires Git >= 2.25).
+        """
         self.log.info("--- Stage: Data Loading (Git Repo) ---")
         if not self.repo_url:
             self.log.error("`source_repo.url` is not defined in config.")
             return False
-        
+
+        if self.sparse and self.folder_to_zip:
+            if self._sparse_clone(temp_dir):
+                return True
+            self.log.warning("Sparse clone failed. Falling back to a full shallow clone.")
+            self._clear_directory(temp_dir)
+
+        return self._full_clone(temp_dir)
+
+    def _sparse_clone(self, temp_dir: Path) -> bool:
+        """Fetches only the target folder using a blob-filtered sparse checkout."""
+        self.log.info(f"Sparse-cloning repo '{self.repo_url}' (branch: {self.branch}, folder: '{self.folder_to_zip}') into '{temp_dir}'")
+
+        git_commands = [
+            ['git', 'clone', '--filter=blob:none', '--no-checkout', '--depth', '1', '--branch', self.branch, self.repo_url, str(temp_dir)],
+            ['git', '-C', str(temp_dir), 'sparse-checkout', 'init', '--cone'],
+            ['git', '-C', str(temp_dir), 'sparse-checkout', 'set', self.folder_to_zip],
+            ['git', '-C', str(temp_dir), 'checkout'],
+        ]
+
+        try:
+            for git_command in git_commands:
+                subprocess.run(git_command, check=True, capture_output=True, text=True, encoding='utf-8')
+            self.log.info("Sparse git clone successful.")
+            return True
+        except subprocess.CalledProcessError as e:
+            self.log.warning(f"Sparse clone step failed with exit code {e.returncode}.\nStderr: {e.stderr}")
+            return False
+        except Exception as e:
+            self.log.warning(f"An unexpected error occurred during sparse clone: {e}")
+            return False
+
+    def _full_clone(self, temp_dir: Path) -> bool:
+        """Performs a plain shallow clone of the whole repository."""
         self.log.info(f"Cloning repo '{self.repo_url}' (branch: {self.branch}) into '{temp_dir}'")
-        
+
         git_command = [
             'git', 'clone', '--depth', '1', '--branch', self.branch, self.repo_url, str(temp_dir)
         ]
-        
+
         try:
             subprocess.run(git_command, check=True, capture_output=True, text=True, encoding='utf-8')
             self.log.info("Git clone successful.")
@@ -279,45 +529,244 @@ class FolderFetcher:
             self.log.error(f"An unexpected error occurred during git clone: {e}")
             return False
 
+    def open_remote_archive_stream(self, folder: str):
+        """
+        Starts `git archive --remote` streaming the target folder as a tar
+        to stdout, which avoids materializing a clone or working tree
+        entirely. Returns the running process, whose stdout can be piped
+        straight into 7-Zip, or None when the remote does not support
+        upload-archive (GitHub, for instance, does not) so callers can fall
+        back to `clone_repo`.
+
+        stderr goes to an unnamed temp file rather than a pipe, so a chatty
+        remote can never fill a pipe buffer and stall the stream (and, in
+        turn, 7-Zip's stdin). The support check waits until either tar data
+        appears on stdout or the process exits, so failures are detected
+        however slow they are instead of being mistaken for success after a
+        fixed grace period.
+        """
+        command = ['git', 'archive', '--format=tar', f'--remote={self.repo_url}', self.branch, folder]
+        self.log.info(f"Streaming '{folder}' from '{self.repo_url}' via git archive...")
+
+        stderr_file = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+        except (FileNotFoundError, OSError) as e:
+            stderr_file.close()
+            self.log.warning(f"Could not start git archive: {e}")
+            return None
+
+        def fail_with_stderr() -> None:
+            stderr_file.seek(0)
+            stderr_text = stderr_file.read().decode('utf-8', errors='replace').strip()
+            stderr_file.close()
+            self.log.warning(f"Remote does not support git archive: {stderr_text}")
+            return None
+
+        # Wait until stdout becomes readable: that means either tar data
+        # (success — a valid archive always carries at least the tar EOF
+        # blocks) or EOF because the process failed. The stream itself is
+        # never read here; 7-Zip consumes the raw descriptor.
+        while True:
+            ready, _, _ = select.select([process.stdout], [], [], 0.5)
+            if not ready:
+                continue
+            # Readable could be EOF-on-failure; give the process a moment
+            # to be reaped before deciding.
+            try:
+                return_code = process.wait(timeout=0.2)
+            except subprocess.TimeoutExpired:
+                return_code = None
+            if return_code not in (None, 0):
+                return fail_with_stderr()
+            stderr_file.close()
+            return process
+
+    @staticmethod
+    def _clear_directory(temp_dir: Path):
+        """Removes any partial clone contents so the directory is empty again."""
+        for child in temp_dir.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink(missing_ok=True)
+
+class RateLimiter:
+    """
+    A thread-safe token bucket used to stay under Telegram's documented
+    limit of roughly 20 messages per minute to the same channel.
+    """
+    def __init__(self, max_events: int, per_seconds: float):
+        self.capacity = float(max_events)
+        self.refill_rate = max_events / per_seconds
+        self.tokens = float(max_events)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait_seconds = (1.0 - self.tokens) / self.refill_rate
+            time.sleep(wait_seconds)
+
 class TelegramPoster:
     """Sends files to the Telegram channel."""
+
+    MAX_SEND_ATTEMPTS = 5
+    MEDIA_GROUP_LIMIT = 10
+
     def __init__(self, config: Dict[str, Any], log: logging.Logger):
         self.config = config
         self.log = log
         self.bot_token = self.config['telegram']['bot_token']
         self.channel_id = self.config['telegram']['channel_id']
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.rate_limiter = RateLimiter(max_events=20, per_seconds=60.0)
+
+        # A persistent session keeps the TCP+TLS connection to
+        # api.telegram.org alive across parts, avoiding a fresh handshake
+        # per upload.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
 
     def send_document(self, file_path: Path, caption: str = "") -> bool:
-        """Sends a single document (file) to the configured Telegram channel."""
+        """Escapes the caption for MarkdownV2 and sends the document."""
+        return self.send_document_escaped(file_path, escape_markdown_v2(caption))
+
+    def send_document_escaped(self, file_path: Path, escaped_caption: str) -> bool:
+        """
+        Sends a single document (file) to the configured Telegram channel.
+        The caption must already be escaped for MarkdownV2, which lets
+        callers that send many parts escape their caption once up front.
+        """
         if not file_path.exists():
             self.log.error(f"Document to send not found at: {file_path}")
             return False
 
-        escaped_caption = escape_markdown_v2(caption)
+        def build_fields(stack):
+            doc_file = stack.enter_context(open(file_path, 'rb'))
+            return {
+                'chat_id': str(self.channel_id),
+                'caption': escaped_caption,
+                'parse_mode': 'MarkdownV2',
+                'document': (file_path.name, doc_file, 'application/x-7z-compressed')
+            }
+
+        return self._post_multipart(f'{self.api_url}/sendDocument', f"'{file_path.name}'", build_fields)
+
+    def send_document_group(self, file_paths: List[Path], escaped_caption: str = "") -> bool:
+        """
+        Sends up to 10 documents in a single `sendMediaGroup` request, which
+        costs one API round trip (and one rate-limiter token) instead of one
+        per part. Only the first document carries the caption, which must
+        already be escaped for MarkdownV2; a single path delegates to
+        `send_document_escaped`.
+        """
+        if len(file_paths) == 1:
+            return self.send_document_escaped(file_paths[0], escaped_caption)
+        if not 2 <= len(file_paths) <= self.MEDIA_GROUP_LIMIT:
+            self.log.error(f"sendMediaGroup accepts 2-{self.MEDIA_GROUP_LIMIT} documents, got {len(file_paths)}.")
+            return False
 
-        send_doc_url = f'{self.api_url}/sendDocument'
-        payload = {
-            'chat_id': self.channel_id,
-            'caption': escaped_caption,
-            'parse_mode': 'MarkdownV2'
-        }
-        
-        self.log.info(f"Uploading '{file_path.name}' to channel {self.channel_id}...")
-        try:
-            with open(file_path, 'rb') as doc_file:
-                files = {'document': (file_path.name, doc_file, 'application/x-7z-compressed')}
-                timeout = self.config.get('runtime', {}).get('request_timeout', 120)
-                response = requests.post(send_doc_url, data=payload, files=files, timeout=timeout)
-                response.raise_for_status()
-            self.log.info(f"Successfully sent document: {file_path.name}")
-            return True
-        except requests.exceptions.RequestException as e:
-            self.log.error(f"Error sending document: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                self.log.error(f"Telegram API response: {e.response.text}")
+        missing = [p for p in file_paths if not p.exists()]
+        if missing:
+            self.log.error(f"Documents to send not found: {', '.join(str(p) for p in missing)}")
+            return False
+
+        media = []
+        for i, _ in enumerate(file_paths):
+            item = {'type': 'document', 'media': f'attach://file{i}'}
+            if i == 0 and escaped_caption:
+                item['caption'] = escaped_caption
+                item['parse_mode'] = 'MarkdownV2'
+            media.append(item)
+
+        def build_fields(stack):
+            fields = {
+                'chat_id': str(self.channel_id),
+                'media': json.dumps(media)
+            }
+            for i, file_path in enumerate(file_paths):
+                doc_file = stack.enter_context(open(file_path, 'rb'))
+                fields[f'file{i}'] = (file_path.name, doc_file, 'application/x-7z-compressed')
+            return fields
+
+        description = f"media group of {len(file_paths)} parts ({file_paths[0].name}..{file_paths[-1].name})"
+        return self._post_multipart(f'{self.api_url}/sendMediaGroup', description, build_fields)
+
+    def _post_multipart(self, url: str, description: str, build_fields) -> bool:
+        """
+        POSTs a multipart request with rate limiting and retries.
+
+        `build_fields` is invoked per attempt with an ExitStack and returns
+        the multipart field mapping; file handles it opens must be registered
+        on the stack so each attempt gets fresh, correctly-closed handles.
+        MultipartEncoder streams the body from disk to the socket in
+        fixed-size chunks instead of buffering whole parts in memory.
+
+        Rate-limit responses (429) are honoured by sleeping for the exact
+        `retry_after` the API reports; transient 5xx errors and network
+        failures are retried with exponential backoff.
+        """
+        timeout = self.config.get('runtime', {}).get('request_timeout', 120)
+
+        backoff_seconds = 1.0
+        for attempt in range(1, self.MAX_SEND_ATTEMPTS + 1):
+            self.rate_limiter.acquire()
+            self.log.info(f"Uploading {description} to channel {self.channel_id} (attempt {attempt})...")
+            try:
+                with contextlib.ExitStack() as stack:
+                    encoder = MultipartEncoder(fields=build_fields(stack))
+                    headers = {'Content-Type': encoder.content_type}
+                    response = self.session.post(url, data=encoder, headers=headers, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                self.log.warning(f"Network error sending {description}: {e}")
+                time.sleep(backoff_seconds)
+                backoff_seconds *= 2
+                continue
+
+            if response.ok:
+                self.log.info(f"Successfully sent {description}.")
+                return True
+
+            if response.status_code == 429:
+                retry_after = self._parse_retry_after(response)
+                self.log.warning(f"Telegram rate limit hit. Waiting {retry_after} seconds as instructed by the API.")
+                time.sleep(retry_after + 0.5)
+                continue
+
+            if 500 <= response.status_code < 600:
+                self.log.warning(f"Telegram server error {response.status_code}. Retrying in {backoff_seconds:.1f} seconds.")
+                time.sleep(backoff_seconds)
+                backoff_seconds *= 2
+                continue
+
+            self.log.error(f"Error sending {description} (HTTP {response.status_code}): {response.text}")
             return False
 
+        self.log.error(f"Giving up on {description} after {self.MAX_SEND_ATTEMPTS} attempts.")
+        return False
+
+    def _parse_retry_after(self, response) -> float:
+        """Extracts `parameters.retry_after` from a 429 response body."""
+        try:
+            return float(response.json().get('parameters', {}).get('retry_after', 5))
+        except (ValueError, AttributeError):
+            return 5.0
+
 # ================================================================
 # 5. MAIN EXECUTION
 # ================================================================
@@ -337,97 +786,230 @@ def main():
             temp_dir = Path(temp_dir_str)
             log.info(f"Created temporary directory: {temp_dir}")
 
-            # 1. Fetch the repository
-            fetcher = FolderFetcher(config, log)
-            if not fetcher.clone_repo(temp_dir):
-                log.error("Aborting workflow due to clone failure.")
-                return
-
-            # 2. Identify the target folder and prepare archive path
             repo_config = config.get('source_repo', {})
             output_config = config.get('output', {})
-            
+
             folder_to_zip_name = repo_config.get('folder_to_zip')
             if not folder_to_zip_name:
                 log.error("`source_repo.folder_to_zip` not specified in config. Aborting.")
                 return
-            
-            source_dir = temp_dir / folder_to_zip_name
-            
-            if not source_dir.is_dir():
-                log.error(f"The specified folder to zip '{folder_to_zip_name}' does not exist in the cloned repository. Aborting.")
-                return
+
+            # 1. Fetch the repository — either as a tar stream straight from
+            # the remote (zero local clone, archive contains one .tar entry)
+            # or via a clone on disk.
+            fetcher = FolderFetcher(config, log)
+
+            tar_stream_process = None
+            if repo_config.get('use_git_archive', False):
+                tar_stream_process = fetcher.open_remote_archive_stream(folder_to_zip_name)
+                if tar_stream_process is None:
+                    log.info("Falling back to the clone-based pipeline.")
+
+            # 2. Identify the target folder and measure it (clone path only)
+            source_dir = None
+            source_size_bytes = -1
+            if tar_stream_process is None:
+                if not fetcher.clone_repo(temp_dir):
+                    log.error("Aborting workflow due to clone failure.")
+                    return
+
+                source_dir = temp_dir / folder_to_zip_name
+
+                if not source_dir.is_dir():
+                    log.error(f"The specified folder to zip '{folder_to_zip_name}' does not exist in the cloned repository. Aborting.")
+                    return
+
+                source_size_bytes = tree_size(source_dir)
 
             output_archive_basename = output_config.get('archive_name', 'archive')
-            archive_output_path = (temp_dir / output_archive_basename).with_suffix('.7z')
-            
-            # 3. Create the multi-volume .7z archive
-            chunk_size_mb = output_config.get('chunk_size_mb', 15)
-            archive_chunks = create_multivolume_archive(log, source_dir, archive_output_path, chunk_size_mb)
-            
-            if not archive_chunks:
-                log.error("Aborting workflow due to archive creation failure.")
-                return
 
-            # 4. Intelligent renaming for single-part archives
-            if len(archive_chunks) == 1 and archive_chunks[0].name.endswith('.001'):
-                single_part = archive_chunks[0]
-                target_path = archive_output_path
-                log.info(f"Only one archive part was created. Renaming '{single_part.name}' to '{target_path.name}'.")
-                try:
-                    single_part.rename(target_path)
-                    archive_chunks = [target_path]
-                except OSError as e:
-                    log.error(f"Failed to rename single archive part: {e}. Proceeding with '.001' name.")
-
-            # 5. Dynamically generate the full caption with timestamps
-            log.info("Generating dynamic caption with timestamps...")
-            
-            # Get timestamps
-            utc_now = datetime.now(timezone.utc)
-            iran_tz = timezone(timedelta(hours=3, minutes=30))
-            iran_now = utc_now.astimezone(iran_tz)
-            jalali_now = jdatetime.datetime.fromgregorian(datetime=iran_now)
-
-            utc_str = utc_now.strftime("%Y-%m-%d %H:%M:%S")
-            jalali_str = jalali_now.strftime("%Y/%m/%d %H:%M:%S")
-
-            # Get components from config
-            base_text = output_config.get('telegram_caption', '')
-            channel_handle = config.get('telegram', {}).get('channel_handle_id', '')
-
-            # Construct the final caption
-            full_caption_parts = [
-                base_text,
-                f"\nLatest Update: `{jalali_str} | {utc_str} UTC`",
-                f"\n{channel_handle}"
-            ]
-            full_caption = "\n".join(part for part in full_caption_parts if part)
-
-            # 6. Send each archive part to Telegram
-            poster = TelegramPoster(config, log)
-            total_parts = len(archive_chunks)
-
-            for i, chunk_path in enumerate(archive_chunks):
-                if runtime_manager.is_time_exceeded():
-                    log.warning("Stopping file upload due to execution time limit.")
-                    break
-                
-                part_num = i + 1
-                # Use the full, dynamic caption for the first part (or only part)
-                # and only a simple part indicator for subsequent parts.
-                if i == 0:
-                    current_caption = f"{full_caption} (Part {part_num}/{total_parts})" if total_parts > 1 else full_caption
+            # The archive exists only to be uploaded, so keep its parts in a
+            # RAM-backed directory when /dev/shm has room — that avoids a disk
+            # write+read round trip. Budget twice the source size to be safe.
+            # (Stream mode has no measurable source, so it stays on disk.)
+            archive_dir_parent = select_ram_backed_dir(2 * source_size_bytes) if source_size_bytes >= 0 else None
+            if archive_dir_parent:
+                log.info(f"Using RAM-backed directory '{archive_dir_parent}' for archive parts.")
+
+            with tempfile.TemporaryDirectory(prefix="archive_", dir=archive_dir_parent) as archive_dir_str:
+                archive_output_path = (Path(archive_dir_str) / output_archive_basename).with_suffix('.7z')
+
+                # 3. Dynamically generate the full caption with timestamps
+                log.info("Generating dynamic caption with timestamps...")
+
+                # Get timestamps
+                utc_now = datetime.now(timezone.utc)
+                iran_tz = timezone(timedelta(hours=3, minutes=30))
+                iran_now = utc_now.astimezone(iran_tz)
+                jalali_now = jdatetime.datetime.fromgregorian(datetime=iran_now)
+
+                utc_str = utc_now.strftime("%Y-%m-%d %H:%M:%S")
+                jalali_str = jalali_now.strftime("%Y/%m/%d %H:%M:%S")
+
+                # Get components from config
+                base_text = output_config.get('telegram_caption', '')
+                channel_handle = config.get('telegram', {}).get('channel_handle_id', '')
+
+                # Construct the final caption
+                full_caption_parts = [
+                    base_text,
+                    f"\nLatest Update: `{jalali_str} | {utc_str} UTC`",
+                    f"\n{channel_handle}"
+                ]
+                full_caption = "\n".join(part for part in full_caption_parts if part)
+
+                # Escape the caption variants once, as reusable templates; a
+                # per-part caption is then a single str.format call with no
+                # escaping inside the upload loop. The NUL-delimited
+                # placeholder contains no MarkdownV2 specials, so it passes
+                # through escaping untouched and is swapped for a format
+                # field afterwards (literal braces are doubled first so
+                # arbitrary config text stays format-safe).
+                placeholder = '\x00PART\x00'
+
+                def make_part_template(text: str) -> str:
+                    escaped = escape_markdown_v2(f"{text} (Part {placeholder})")
+                    return escaped.replace('{', '{{').replace('}', '}}').replace(placeholder, '{part_num}')
+
+                escaped_full_caption = escape_markdown_v2(full_caption)
+                first_part_template = make_part_template(full_caption)
+                tail_part_template = make_part_template(output_archive_basename)
+
+                # 4. Start the upload worker so parts are sent while 7-Zip is
+                # still compressing later volumes (CPU and network overlap).
+                poster = TelegramPoster(config, log)
+                part_queue: "queue.Queue" = queue.Queue()
+                upload_failed = threading.Event()
+                upload_concurrency = output_config.get('upload_concurrency', 3)
+
+                def send_batch(batch):
+                    # Runs on pool threads whose futures are discarded, so no
+                    # exception may escape: anything unexpected must still
+                    # mark the run as failed instead of vanishing silently.
+                    try:
+                        if upload_failed.is_set():
+                            return
+                        if runtime_manager.is_time_exceeded():
+                            log.warning("Skipping file upload due to execution time limit.")
+                            return
+
+                        # Use the full, dynamic caption when the batch starts with
+                        # the first part (or only part) and a simple part indicator
+                        # otherwise. Later parts in a batch carry no caption; their
+                        # .NNN filenames keep the ordering visible.
+                        part_num, total_parts, _ = batch[0]
+                        if part_num == 1:
+                            if total_parts == 1:
+                                escaped_caption = escaped_full_caption
+                            else:
+                                escaped_caption = first_part_template.format(part_num=part_num)
+                        else:
+                            escaped_caption = tail_part_template.format(part_num=part_num)
+
+                        chunk_paths = [chunk_path for _, _, chunk_path in batch]
+                        if not poster.send_document_group(chunk_paths, escaped_caption):
+                            log.error(f"Failed to send chunk(s): {', '.join(p.name for p in chunk_paths)}. Aborting remaining uploads.")
+                            upload_failed.set()
+                    except Exception as e:
+                        log.error(f"Unexpected error while sending archive parts: {e}", exc_info=True)
+                        upload_failed.set()
+
+                def upload_worker():
+                    # A small pool uploads batches concurrently; the shared token
+                    # bucket in TelegramPoster keeps the combined rate legal.
+                    with ThreadPoolExecutor(max_workers=upload_concurrency, thread_name_prefix="Uploader") as pool:
+                        finished = False
+                        pending_first = None
+                        while not finished:
+                            if pending_first is not None:
+                                item, pending_first = pending_first, None
+                            else:
+                                item = part_queue.get()
+                            if item is None:
+                                break
+                            batch = [item]
+                            # Greedily drain parts that are already waiting so
+                            # they ride in one sendMediaGroup call (max 10).
+                            while len(batch) < TelegramPoster.MEDIA_GROUP_LIMIT:
+                                try:
+                                    extra = part_queue.get_nowait()
+                                except queue.Empty:
+                                    break
+                                if extra is None:
+                                    finished = True
+                                    break
+                                if extra[0] == 1:
+                                    # The caption is taken from the batch's
+                                    # first part, so part 1 must lead its own
+                                    # batch — never ride mid-batch behind
+                                    # another part. Close this batch and start
+                                    # the next one with part 1.
+                                    pending_first = extra
+                                    break
+                                batch.append(extra)
+                            if batch[0][0] == 1:
+                                # Part 1 only arrives once 7-Zip has finished
+                                # (its header is finalized last); send its
+                                # caption-bearing batch in-line so it precedes
+                                # any parts drained after it.
+                                send_batch(batch)
+                            else:
+                                pool.submit(send_batch, batch)
+
+                uploader = threading.Thread(target=upload_worker, name="UploadWorker", daemon=True)
+                uploader.start()
+
+                # 5. Create the multi-volume .7z archive, streaming parts to the
+                # uploader as they are completed.
+                chunk_size_mb = output_config.get('chunk_size_mb', 15)
+                threads = output_config.get('threads', 0)
+                level = output_config.get('level', 9)
+
+                # Default to plain lzma2: the stock p7zip in CI has no
+                # flzma2/zstd codec, and those are opt-in for users who
+                # install a capable binary (detection falls back anyway).
+                method = output_config.get('method', 'lzma2')
+                if method != 'lzma2' and method not in config_manager.available_7z_methods:
+                    log.warning(f"7-Zip binary does not support method '{method}'. Falling back to 'lzma2'.")
+                    method = 'lzma2'
+
+                solid_block_mb = output_config.get('solid_block_mb', 16)
+
+                if tar_stream_process is not None:
+                    archive_chunks = create_multivolume_archive_from_stream(log, tar_stream_process.stdout, archive_output_path, chunk_size_mb, threads, method, level, part_queue, solid_block_mb)
+                    tar_stream_process.stdout.close()
+                    if tar_stream_process.wait() != 0:
+                        log.error(f"git archive stream failed with exit code {tar_stream_process.returncode}; discarding the (possibly truncated) archive. Parts already uploaded may be incomplete.")
+                        archive_chunks = []
                 else:
-                    current_caption = f"{output_archive_basename} (Part {part_num}/{total_parts})"
-
-                if not poster.send_document(chunk_path, current_caption):
-                    log.error(f"Failed to send chunk: {chunk_path.name}. Aborting remaining uploads.")
-                    break
-                
-                if part_num < total_parts:
-                    log.info("Waiting 3 seconds before sending next part...")
-                    time.sleep(3)
+                    archive_chunks = create_multivolume_archive(log, source_dir, archive_output_path, chunk_size_mb, threads, method, level, part_queue, source_size_bytes, solid_block_mb)
+
+                if not archive_chunks:
+                    part_queue.put(None)
+                    uploader.join()
+                    log.error("Aborting workflow due to archive creation failure.")
+                    return
+
+                # 6. Intelligent renaming for single-part archives; these were not
+                # streamed, so they are handed to the uploader here.
+                if len(archive_chunks) == 1:
+                    single_part = archive_chunks[0]
+                    if single_part.name.endswith('.001'):
+                        target_path = archive_output_path
+                        log.info(f"Only one archive part was created. Renaming '{single_part.name}' to '{target_path.name}'.")
+                        try:
+                            single_part.rename(target_path)
+                            single_part = target_path
+                        except OSError as e:
+                            log.error(f"Failed to rename single archive part: {e}. Proceeding with '.001' name.")
+                    part_queue.put((1, 1, single_part))
+
+                # 7. Wait for all queued uploads to finish
+                part_queue.put(None)
+                uploader.join()
+
+                if upload_failed.is_set():
+                    log.error("One or more archive parts failed to upload.")
 
     except Exception as e:
         log.critical(f"An unhandled exception occurred in the main execution block: {e}", exc_info=True)